@@ -0,0 +1,111 @@
+from cards import SUITS, RANKS
+
+SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+ALL_CARDS = (1 << (len(SUITS) * len(RANKS))) - 1
+
+
+def card_bit(card) -> int:
+    return 1 << (SUIT_INDEX[card.suit] * len(RANKS) + RANK_INDEX[card.rank])
+
+
+def beaters_mask(card) -> int:
+    """Bits of every card that beats ``card`` (same suit, higher rank)."""
+    base = SUIT_INDEX[card.suit] * len(RANKS)
+    higher = len(RANKS) - RANK_INDEX[card.rank] - 1
+    return ((1 << higher) - 1) << (base + RANK_INDEX[card.rank] + 1)
+
+
+class BeliefTracker:
+    """Track what each player knows about the whereabouts of every card.
+
+    The engine reports draws, plays, reveals, captures, discards and
+    reshuffles as they happen; every update is a handful of bit operations.
+    A card is *known* to a player while they know where it is. Cards known
+    to both players are public, cards known to one are private to them and
+    everything else is unseen by that player. When the discard pile is
+    shuffled back into the deck its cards become unseen again.
+    """
+
+    def __init__(self, cards):
+        self.cards = {card_bit(c): c for c in cards}
+        self.known = [0, 0]
+        self.hand_sizes = [0, 0]
+        self.discard = 0
+
+    # engine events
+    def drew(self, player, card):
+        """``player`` drew ``card`` into their hand."""
+        self.known[player] |= card_bit(card)
+        self.hand_sizes[player] += 1
+
+    def played(self, player, n=1):
+        """``player`` played ``n`` cards face down from their hand."""
+        self.hand_sizes[player] -= n
+
+    def revealed(self, *cards):
+        for card in cards:
+            bit = card_bit(card)
+            self.known[0] |= bit
+            self.known[1] |= bit
+
+    def captured(self, player, card):
+        """``player`` took ``card`` face down into an army."""
+        self.known[player] |= card_bit(card)
+
+    def discarded(self, cards):
+        for card in cards:
+            self.discard |= card_bit(card)
+
+    def reshuffled(self):
+        """The discard pile was shuffled back into the deck."""
+        self.known[0] &= ~self.discard
+        self.known[1] &= ~self.discard
+        self.discard = 0
+
+    # queries
+    def public(self):
+        return self.decode(self.known[0] & self.known[1])
+
+    def private(self, player):
+        return self.decode(self.known[player] & ~self.known[1 - player])
+
+    def unseen(self, player):
+        return self.decode(ALL_CARDS & ~self.known[player])
+
+    def unseen_count(self, player) -> int:
+        return (ALL_CARDS & ~self.known[player]).bit_count()
+
+    def p_opponent_beats(self, player, card) -> float:
+        """Probability that ``player``'s opponent holds a card beating ``card``.
+
+        Assumes the opponent's hand is a uniform draw from the cards unseen
+        by ``player``.
+        """
+        unseen = ALL_CARDS & ~self.known[player]
+        n = unseen.bit_count()
+        good = (unseen & beaters_mask(card)).bit_count()
+        p_none = 1.0
+        for i in range(min(self.hand_sizes[1 - player], n)):
+            p_none *= (n - good - i) / (n - i)
+        return 1.0 - max(p_none, 0.0)
+
+    def p_bluff(self, player, card) -> float:
+        """Probability that the opponent's last face-down play does not beat ``card``.
+
+        Assumes the played card is a uniform draw from the cards unseen by
+        ``player``.
+        """
+        unseen = ALL_CARDS & ~self.known[player]
+        n = unseen.bit_count()
+        if not n:
+            return 0.0
+        return 1.0 - (unseen & beaters_mask(card)).bit_count() / n
+
+    def decode(self, mask):
+        cards = []
+        while mask:
+            bit = mask & -mask
+            cards.append(self.cards[bit])
+            mask ^= bit
+        return cards
@@ -0,0 +1,141 @@
+# Offscreen export of game replays to image sequences and contact sheets
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import sys
+import json
+import math
+import signal
+import random
+import importlib
+import multiprocessing
+import pygame
+from fuzz import Agent, play_game
+from rendering import CardImages, Fonts
+
+THUMB_WIDTH = 256
+LABEL_COLOR = (255, 255, 255)
+
+# per-process caches shared by every game a worker renders
+card_images = None
+fonts = None
+
+
+def init_worker():
+    global card_images, fonts
+    sys.stdout = open(os.devnull, 'w')
+    pygame.init()
+    # SDL turns SIGTERM into a quit event; restore it so Pool.terminate works
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # convert_alpha needs a display mode, even with the dummy driver
+    pygame.display.set_mode((1, 1))
+    card_images = CardImages(max_sizes=1)
+    fonts = Fonts()
+
+
+class FrameRecorder:
+    """Wraps an agent and captures the table at every decision point."""
+
+    def __init__(self, agent, directory=None, thumb_size=None):
+        self.agent = agent
+        self.directory = directory
+        self.thumb_size = thumb_size
+        self.thumbs = []
+        self.count = 0
+
+    @property
+    def failure(self):
+        return self.agent.failure
+
+    def choose_action(self, game, player, reveal, pile):
+        action = self.agent.choose_action(game, player, reveal, pile)
+        if reveal is None:
+            # the war phase does not redraw the table itself
+            game.show_state()
+        self.count += 1
+        label = f'{self.count}: {player.name} {action}'
+        if self.thumb_size:
+            thumb = pygame.transform.smoothscale(game.screen, self.thumb_size)
+            font = fonts.get(max(10, self.thumb_size[1] // 12))
+            thumb.blit(font.render(label, True, LABEL_COLOR), (4, 4))
+            self.thumbs.append(thumb)
+        else:
+            font = fonts.get(max(12, game.screen.get_height() // 30))
+            game.screen.blit(font.render(label, True, LABEL_COLOR), (10, 10))
+            pygame.image.save(game.screen, os.path.join(self.directory, f'{self.count:04d}.png'))
+        return action
+
+
+def contact_sheet(thumbs, columns):
+    width, height = thumbs[0].get_size()
+    rows = math.ceil(len(thumbs) / columns)
+    sheet = pygame.Surface((columns * width, rows * height))
+    sheet.fill((0, 0, 0))
+    for i, thumb in enumerate(thumbs):
+        sheet.blit(thumb, ((i % columns) * width, (i // columns) * height))
+    return sheet
+
+
+def export_game(job):
+    """Render one recorded or simulated game; return (output path, frames)."""
+    case, size, out_dir, sheet_columns, budget = job
+    engine = importlib.import_module(case['engine'])
+    name = f"{case['engine']}-{case['seed']}"
+    if case.get('actions') is not None:
+        agent = Agent(script=case['actions'])
+    else:
+        agent = Agent(rng=random.Random(case['seed']), budget=budget)
+    if sheet_columns:
+        thumb_size = (THUMB_WIDTH, round(THUMB_WIDTH * size[1] / size[0]))
+        recorder = FrameRecorder(agent, thumb_size=thumb_size)
+        path = os.path.join(out_dir, f'{name}.png')
+    else:
+        path = os.path.join(out_dir, name)
+        os.makedirs(path, exist_ok=True)
+        recorder = FrameRecorder(agent, directory=path)
+    play_game(engine, case['seed'], recorder,
+              screen=pygame.Surface(size), card_images=card_images)
+    if sheet_columns and recorder.thumbs:
+        pygame.image.save(contact_sheet(recorder.thumbs, sheet_columns), path)
+    return path, recorder.count
+
+
+def export(cases, out_dir, size, processes=None, sheet_columns=0, budget=500):
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(case, size, out_dir, sheet_columns, budget) for case in cases]
+    with multiprocessing.Pool(processes, initializer=init_worker) as pool:
+        yield from pool.imap_unordered(export_game, jobs)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render King of Montenegro games to images without a window')
+    parser.add_argument('--replays', help='JSON lines of recorded games (engine, seed, actions), e.g. from fuzz.py')
+    parser.add_argument('--engine', default='modern_game', help='engine module for simulated games')
+    parser.add_argument('--games', type=int, default=10, help='number of simulated games when no replays are given')
+    parser.add_argument('--start', type=int, default=0, help='first simulated game seed')
+    parser.add_argument('--budget', type=int, default=500, help='maximum actions per simulated game')
+    parser.add_argument('--size', default='1024x768', help='frame size, WIDTHxHEIGHT')
+    parser.add_argument('--sheet', type=int, default=0, metavar='COLUMNS',
+                        help='write one contact sheet per game with this many columns instead of frames')
+    parser.add_argument('--processes', type=int, help='worker processes (default: all CPUs)')
+    parser.add_argument('--out', default='frames', help='output directory')
+    args = parser.parse_args()
+
+    size = tuple(int(n) for n in args.size.lower().split('x'))
+    if args.replays:
+        with open(args.replays) as f:
+            cases = [json.loads(line) for line in f if line.strip()]
+    else:
+        cases = [{'engine': args.engine, 'seed': seed} for seed in range(args.start, args.start + args.games)]
+
+    try:
+        importlib.import_module(cases[0]['engine'] if cases else args.engine).ensure_card_images()
+    except Exception as e:
+        print('Failed to generate card images:', e)
+        sys.exit(1)
+
+    for path, frames in export(cases, args.out, size, args.processes, args.sheet, args.budget):
+        print(f'{path}: {frames} frames')
@@ -0,0 +1,235 @@
+# Rule-invariant fuzzer for the King of Montenegro engines
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import sys
+import json
+import time
+import random
+import importlib
+import multiprocessing
+from cards import SUITS
+
+DECK_SIZE = 52
+MAX_HAND = 3
+BATCH_SIZE = 500
+
+
+class StopGame(BaseException):
+    """Ends a fuzzed game from inside an agent.
+
+    Derived from BaseException so the engine's handling of AI errors does
+    not swallow it.
+    """
+
+
+def check_invariants(game, player=None, reveal=None, pile=None):
+    """Return a description of the first broken invariant, or None."""
+    groups = [game.deck.cards, game.discard, game.drawn_kings]
+    for p in game.players:
+        if len(p.hand) > MAX_HAND:
+            return f'{p.name} holds {len(p.hand)} cards'
+        groups.append(p.hand)
+        groups.extend(p.armies.values())
+    if reveal is not None:
+        groups.append((reveal,))
+    for _, played in pile or ():
+        groups.append(played if isinstance(played, tuple) else (played,))
+    total = sum(map(len, groups))
+    distinct = len(set().union(*groups))
+    if total != DECK_SIZE or distinct != DECK_SIZE:
+        return f'{total} cards in play, {distinct} distinct'
+    if game.turn not in (0, 1):
+        return f'invalid turn {game.turn}'
+    if player is not None:
+        actor = game.players.index(player)
+        expected = game.turn if pile is None else (game.turn + len(pile)) % 2
+        if actor != expected:
+            return f'{player.name} acting out of turn'
+        for k, (owner, _) in enumerate(pile or ()):
+            if owner != (game.turn + k) % 2:
+                return f'play {k} of the duel made out of turn'
+    return None
+
+
+def random_action(rng, player, reveal, pile):
+    """Mostly legal moves, with some malformed and adversarial ones."""
+    hand = len(player.hand)
+    roll = rng.random()
+    if reveal is None:
+        # war phase
+        if roll < 0.7:
+            return 'pass'
+        return ' '.join(['war'] + rng.choices(SUITS + ['bogus'], k=rng.randint(0, 3)))
+    if roll < 0.45:
+        return f'play {rng.randrange(hand)}' if hand else 'concede'
+    if roll < 0.6:
+        return 'call'
+    if roll < 0.7:
+        return 'concede'
+    if roll < 0.8:
+        kings = [i for i, c in enumerate(player.hand) if c.is_king]
+        k_idx = rng.choice(kings) if kings else rng.randrange(-1, 4)
+        return f'wild {k_idx} {rng.randrange(-1, 4)}'
+    return rng.choice([
+        'play', 'play x', f'play {rng.randint(-2, 5)}', 'wild', 'wild 0',
+        f'wild {rng.randint(-2, 5)} {rng.randint(-2, 5)}', '', 'pass',
+        'war spades', 'call now',
+    ])
+
+
+class Agent:
+    """Plays both seats, checking invariants before every decision.
+
+    Actions come from ``script`` when replaying, otherwise they are drawn
+    from ``rng``. Every action returned is recorded in ``actions``.
+    """
+
+    def __init__(self, rng=None, script=None, budget=2000):
+        self.rng = rng
+        self.script = iter(script) if script is not None else None
+        self.budget = budget
+        self.actions = []
+        self.failure = None
+
+    def choose_action(self, game, player, reveal, pile):
+        self.failure = check_invariants(game, player, reveal, pile)
+        if self.failure:
+            raise StopGame
+        if self.script is not None:
+            action = next(self.script, None)
+            if action is None:
+                raise StopGame
+        else:
+            if len(self.actions) >= self.budget:
+                raise StopGame
+            action = random_action(self.rng, player, reveal, pile)
+        self.actions.append(action)
+        return action
+
+
+def play_game(engine, seed, agent, **options):
+    """Run one game and return its failure description, or None.
+
+    The game is headless unless other ``Game`` options are given.
+    """
+    random.seed(seed)
+    game = engine.Game(**(options or {'headless': True}))
+    for p in game.players:
+        p.ai = agent
+    try:
+        while game.check_victory() is None:
+            if hasattr(game, 'war_phase'):
+                game.war_phase()
+            if not game.duel():
+                break
+            failure = check_invariants(game)
+            if failure:
+                return failure
+    except StopGame:
+        return agent.failure
+    except Exception as e:
+        return f'{type(e).__name__}: {e}'
+    return None
+
+
+def replay(engine, seed, actions):
+    return play_game(engine, seed, Agent(script=actions))
+
+
+def shrink(engine, seed, actions):
+    """Delta-debug ``actions`` down to a minimal sequence that still fails."""
+    n = 2
+    while len(actions) >= 2:
+        chunk = -(-len(actions) // n)
+        for start in range(0, len(actions), chunk):
+            candidate = actions[:start] + actions[start + chunk:]
+            if replay(engine, seed, candidate):
+                actions = candidate
+                n = max(n - 1, 2)
+                break
+        else:
+            if n >= len(actions):
+                break
+            n = min(n * 2, len(actions))
+    return actions
+
+
+def run_batch(job):
+    engine_name, seeds, budget, shrink_limit = job
+    engine = importlib.import_module(engine_name)
+    failures = []
+    failed = 0
+    for seed in seeds:
+        agent = Agent(rng=random.Random(seed), budget=budget)
+        failure = play_game(engine, seed, agent)
+        if not failure:
+            continue
+        failed += 1
+        if len(failures) < shrink_limit:
+            actions = shrink(engine, seed, agent.actions)
+            failures.append({
+                'engine': engine_name,
+                'seed': seed,
+                'actions': actions,
+                'failure': replay(engine, seed, actions),
+            })
+    return len(seeds), failed, failures
+
+
+def silence():
+    sys.stdout = open(os.devnull, 'w')
+
+
+def fuzz(engine_name, games, start=0, processes=None, budget=2000, shrink_limit=3):
+    jobs = [
+        (engine_name, range(s, min(s + BATCH_SIZE, start + games)), budget, shrink_limit)
+        for s in range(start, start + games, BATCH_SIZE)
+    ]
+    played = failed = 0
+    failures = []
+    with multiprocessing.Pool(processes, initializer=silence) as pool:
+        for n, f, found in pool.imap_unordered(run_batch, jobs):
+            played += n
+            failed += f
+            failures.extend(found)
+    return played, failed, failures
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fuzz the King of Montenegro rules engine')
+    parser.add_argument('--engine', default='modern_game', help='engine module (game or modern_game)')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--start', type=int, default=0, help='first game seed')
+    parser.add_argument('--processes', type=int, help='worker processes (default: all CPUs)')
+    parser.add_argument('--budget', type=int, default=2000, help='maximum actions per game')
+    parser.add_argument('--output', default='fuzz_failures.jsonl', help='where to write minimal replays')
+    parser.add_argument('--replay', help='replay failures from a file written by --output')
+    args = parser.parse_args()
+
+    if args.replay:
+        status = 0
+        with open(args.replay) as f:
+            for line in f:
+                case = json.loads(line)
+                engine = importlib.import_module(case['engine'])
+                failure = replay(engine, case['seed'], case['actions'])
+                print(f"seed {case['seed']}: {failure or 'passed'}", file=sys.stderr)
+                status |= bool(failure)
+        sys.exit(status)
+
+    began = time.perf_counter()
+    played, failed, failures = fuzz(
+        args.engine, args.games, args.start, args.processes, args.budget
+    )
+    elapsed = time.perf_counter() - began
+    print(f'{played} games in {elapsed:.1f}s ({played / elapsed:.0f}/s), {failed} failed')
+    if failures:
+        with open(args.output, 'w') as f:
+            for case in failures:
+                f.write(json.dumps(case) + '\n')
+                print(f"seed {case['seed']}: {case['failure']} after {len(case['actions'])} actions")
+        print(f'Minimal replays written to {args.output}')
+        sys.exit(1)
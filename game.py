@@ -5,6 +5,8 @@ import importlib
 import pygame
 from cards import Deck, SUITS, SYMBOLS
 from collections import defaultdict
+from beliefs import BeliefTracker
+from rendering import CARD_WIDTH, CARD_HEIGHT, Layout, CardImages, Fonts
 
 EXPECTED_CARDS = [f"{r}_of_{s}.png" for s in SUITS for r in (
     ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
@@ -23,8 +25,7 @@ def ensure_card_images():
         print('Generating card images...')
         subprocess.run([sys.executable, 'render_cards.py'], check=True)
 
-CARD_WIDTH = 80
-CARD_HEIGHT = 120
+BASE_SIZE = (800, 600)
 
 class Player:
     def __init__(self, name, ai=None):
@@ -45,12 +46,21 @@ class Player:
         return None
 
 class Game:
-    def __init__(self, ai_module: str | None = None):
-        pygame.init()
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption('King of Montenegro')
+    def __init__(self, ai_module: str | None = None, headless: bool = False,
+                 screen: pygame.Surface | None = None, card_images: CardImages | None = None):
+        # headless games run the rules engine only, without a window
+        self.headless = headless
+        # offscreen games draw onto the given surface instead of a window
+        self.offscreen = screen is not None
+        if not headless:
+            pygame.init()
+            self.screen = screen
+            if screen is None:
+                self.screen = pygame.display.set_mode(BASE_SIZE, pygame.RESIZABLE)
+                pygame.display.set_caption('King of Montenegro')
         self.deck = Deck()
         self.discard = []
+        self.beliefs = BeliefTracker(self.deck.cards)
         players = [Player('Player 1')]
         if ai_module:
             try:
@@ -63,28 +73,39 @@ class Game:
         else:
             players.append(Player('Player 2'))
         self.players = players
-        for p in self.players:
+        for i, p in enumerate(self.players):
             p.draw(self.draw_card, 3)
+            for card in p.hand:
+                self.beliefs.drew(i, card)
         self.turn = 0
-        self.card_images = {}
-        self.load_images()
-        self.font = pygame.font.SysFont('arial', 20)
+        self.drawn_kings = []  # Kings revealed and set aside this duel
+        if not headless:
+            self.card_images = card_images or CardImages()
+            self.fonts = Fonts()
+            self.layout = None
+            self.update_layout()
 
     def draw_card(self):
         card = self.deck.draw()
         if not card and self.discard:
             self.deck.add_cards(self.discard)
             self.discard = []
+            self.beliefs.reshuffled()
             card = self.deck.draw()
         return card
 
+    def discard_cards(self, cards):
+        self.discard.extend(cards)
+        self.beliefs.discarded(cards)
+
     def maintain_hands(self):
-        for p in self.players:
+        for i, p in enumerate(self.players):
             while len(p.hand) < 3:
                 card = self.draw_card()
                 if not card:
                     break
                 p.hand.append(card)
+                self.beliefs.drew(i, card)
 
     def declare_war(self, attacker, defender, suit, reinforcements):
         if not attacker.armies[suit] or not defender.armies[suit]:
@@ -99,12 +120,12 @@ class Game:
         defend_total = len(defender.armies[suit]) + sum(1 for c in defender.hand if c.suit == suit)
         if attack_total > defend_total:
             print(f"{attacker.name} wins the war for {suit}!")
-            self.discard.extend(defender.armies[suit])
+            self.discard_cards(defender.armies[suit])
             defender.armies[suit] = []
         else:
             print(f"{defender.name} defends {suit} successfully.")
             for r in [suit] + reinforcements:
-                self.discard.extend(attacker.armies[r])
+                self.discard_cards(attacker.armies[r])
                 attacker.armies[r] = []
 
     def war_phase(self):
@@ -124,32 +145,36 @@ class Game:
                 self.declare_war(player, opponent, suit, reinforcements)
                 self.maintain_hands()
 
-    def load_images(self):
-        for fname in os.listdir('cards'):
-            if fname.endswith('.png'):
-                img = pygame.image.load(os.path.join('cards', fname)).convert_alpha()
-                self.card_images[fname[:-4]] = img
+    def update_layout(self):
+        size = self.screen.get_size()
+        if self.layout is None or self.layout.size != size:
+            self.layout = Layout(size, BASE_SIZE)
+            self.font = self.fonts.get(self.layout.length(20))
 
     def render_hand(self, player, y):
         for i, card in enumerate(player.hand):
             key = f"{card.rank}_of_{card.suit}"
-            img = self.card_images.get(key)
+            img = self.card_images.get(key, self.layout.card_size)
             if img:
-                rect = img.get_rect(topleft=(20 + i * (CARD_WIDTH + 10), y))
+                rect = self.layout.card_rect(20 + i * (CARD_WIDTH + 10), y)
                 self.screen.blit(img, rect)
                 txt = self.font.render(str(i), True, (0,0,0))
-                self.screen.blit(txt, (rect.x, rect.y + CARD_HEIGHT + 5))
+                self.screen.blit(txt, self.layout.point(20 + i * (CARD_WIDTH + 10), y + CARD_HEIGHT + 5))
 
     def show_state(self, reveal=None):
+        if self.headless:
+            return
+        self.update_layout()
         self.screen.fill((0,128,0))
         self.render_hand(self.players[0], 400)
         self.render_hand(self.players[1], 20)
         if reveal:
-            img = self.card_images.get(f"{reveal.rank}_of_{reveal.suit}")
+            img = self.card_images.get(f"{reveal.rank}_of_{reveal.suit}", self.layout.card_size)
             if img:
-                rect = img.get_rect(center=(400, 250))
+                rect = img.get_rect(center=self.layout.point(400, 250))
                 self.screen.blit(img, rect)
-        pygame.display.flip()
+        if not self.offscreen:
+            pygame.display.flip()
 
     def get_input(self, prompt, player, reveal, pile):
         if player.ai:
@@ -164,12 +189,13 @@ class Game:
 
     def duel(self):
         reveal = self.draw_card()
-        drawn_king = None
         while reveal and reveal.rank == 'K':
-            drawn_king = reveal
+            self.beliefs.revealed(reveal)
+            self.drawn_kings.append(reveal)
             reveal = self.draw_card()
         if not reveal:
             return False
+        self.beliefs.revealed(reveal)
         pile = []
         current = self.turn
         opponent = 1 - current
@@ -190,6 +216,7 @@ class Game:
                     print('invalid card')
                     continue
                 pile.append((current, card))
+                self.beliefs.played(current)
                 self.maintain_hands()
                 current, opponent = opponent, current
             elif action.startswith('wild'):
@@ -218,6 +245,7 @@ class Game:
                     player.hand.insert(k_idx, king)
                     continue
                 pile.append((current, (king, card)))
+                self.beliefs.played(current, 2)
                 self.maintain_hands()
                 current, opponent = opponent, current
             elif action == 'call':
@@ -226,45 +254,51 @@ class Game:
                     continue
                 last_player, last_play = pile[-1]
                 if isinstance(last_play, tuple):
+                    self.beliefs.revealed(*last_play)
                     king_card, last_card = last_play
                     valid = last_card.suit == reveal.suit and last_card.value > reveal.value
                 else:
+                    self.beliefs.revealed(last_play)
                     last_card = last_play
                     valid = last_card.beats(reveal)
-                winner = last_player if valid else opponent
-                loser = opponent if valid else last_player
+                winner = last_player if valid else current
                 win_p = self.players[winner]
-                lose_p = self.players[loser]
                 win_p.armies[reveal.suit].append(reveal)
                 bonus = self.draw_card()
                 if bonus:
                     win_p.armies[reveal.suit].append(bonus)
-                if drawn_king:
-                    win_p.armies[reveal.suit].append(drawn_king)
-                if isinstance(last_play, tuple):
+                    self.beliefs.captured(winner, bonus)
+                win_p.armies[reveal.suit].extend(self.drawn_kings)
+                self.drawn_kings = []
+                if winner == last_player:
+                    if isinstance(last_play, tuple):
+                        win_p.armies[king_card.suit].append(king_card)
                     win_p.armies[last_card.suit].append(last_card)
-                    self.discard.append(king_card) if winner != last_player else win_p.armies[king_card.suit].append(king_card)
                 else:
-                    win_p.armies[last_card.suit].append(last_card)
-                if winner != last_player:
                     # loser card(s) discarded
                     if isinstance(last_play, tuple):
-                        self.discard.extend([king_card, last_card])
+                        self.discard_cards([king_card, last_card])
+                    else:
+                        self.discard_cards([last_card])
+                # earlier answers in the duel are discarded
+                for _, played in pile[:-1]:
+                    if isinstance(played, tuple):
+                        self.discard_cards(played)
                     else:
-                        self.discard.append(last_card)
+                        self.discard_cards([played])
                 self.turn = winner
                 self.maintain_hands()
                 print(f"{win_p.name} wins the duel")
                 break
             elif action == 'concede':
                 self.players[opponent].armies[reveal.suit].append(reveal)
-                if drawn_king:
-                    self.players[opponent].armies[reveal.suit].append(drawn_king)
+                self.players[opponent].armies[reveal.suit].extend(self.drawn_kings)
+                self.drawn_kings = []
                 for _, played in pile:
                     if isinstance(played, tuple):
-                        self.discard.extend(played)
+                        self.discard_cards(played)
                     else:
-                        self.discard.append(played)
+                        self.discard_cards([played])
                 self.turn = opponent
                 self.maintain_hands()
                 print(f"{self.players[opponent].name} wins the duel by concession")
@@ -6,13 +6,14 @@ import importlib
 import pygame
 from cards import Deck, SUITS
 from collections import defaultdict
+from beliefs import BeliefTracker
+from rendering import CARD_WIDTH, CARD_HEIGHT, Layout, CardImages, Fonts
 
 EXPECTED_CARDS = [f"{r}_of_{s}.png" for s in SUITS for r in (
     ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 )] + ['back.png']
 
-CARD_WIDTH = 80
-CARD_HEIGHT = 120
+BASE_SIZE = (1024, 768)
 
 
 def ensure_card_images():
@@ -49,13 +50,22 @@ class Player:
 
 
 class Game:
-    def __init__(self, ai_module: str | None = None):
-        pygame.init()
-        self.screen = pygame.display.set_mode((1024, 768))
-        pygame.display.set_caption('King of Montenegro - Modern')
-        self.clock = pygame.time.Clock()
+    def __init__(self, ai_module: str | None = None, headless: bool = False,
+                 screen: pygame.Surface | None = None, card_images: CardImages | None = None):
+        # headless games run the rules engine only, without a window
+        self.headless = headless
+        # offscreen games draw onto the given surface instead of a window
+        self.offscreen = screen is not None
+        if not headless:
+            pygame.init()
+            self.screen = screen
+            if screen is None:
+                self.screen = pygame.display.set_mode(BASE_SIZE, pygame.RESIZABLE)
+                pygame.display.set_caption('King of Montenegro - Modern')
+            self.clock = pygame.time.Clock()
         self.deck = Deck()
         self.discard = []
+        self.beliefs = BeliefTracker(self.deck.cards)
         players = [Player('Player 1')]
         if ai_module:
             try:
@@ -68,42 +78,59 @@ class Game:
         else:
             players.append(Player('Player 2'))
         self.players = players
-        for p in self.players:
+        for i, p in enumerate(self.players):
             p.draw(self.draw_card, 3)
+            for card in p.hand:
+                self.beliefs.drew(i, card)
         self.turn = 0
-        self.card_images = {}
-        self.load_images()
-        self.font = pygame.font.SysFont('arial', 20)
+        self.drawn_kings = []  # Kings revealed and set aside this duel
+        if not headless:
+            self.card_images = card_images or CardImages()
+            self.fonts = Fonts()
+            self.layout = None
+            self.update_layout()
 
-        self.play_area = pygame.Rect(462, 324, CARD_WIDTH, CARD_HEIGHT)
         self.dragging = None  # (index, offset)
         self.drag_pos = (0, 0)
+        self.hand_rects = []
 
         self.message = ''
 
-    def load_images(self):
-        for fname in os.listdir('cards'):
-            if fname.endswith('.png'):
-                img = pygame.image.load(os.path.join('cards', fname)).convert_alpha()
-                self.card_images[fname[:-4]] = img
-
     def draw_card(self):
         card = self.deck.draw()
         if not card and self.discard:
             self.deck.add_cards(self.discard)
             self.discard = []
+            self.beliefs.reshuffled()
             card = self.deck.draw()
         return card
 
+    def discard_cards(self, cards):
+        self.discard.extend(cards)
+        self.beliefs.discarded(cards)
+
     def maintain_hands(self):
-        for p in self.players:
+        for i, p in enumerate(self.players):
             while len(p.hand) < 3:
                 card = self.draw_card()
                 if not card:
                     break
                 p.hand.append(card)
+                self.beliefs.drew(i, card)
 
     # GUI utilities
+    def update_layout(self):
+        """Recompute screen rects when the window size changes."""
+        size = self.screen.get_size()
+        if self.layout is not None and self.layout.size == size:
+            return
+        layout = self.layout = Layout(size, BASE_SIZE)
+        self.font = self.fonts.get(layout.length(20))
+        self.play_area = layout.rect(462, 324, CARD_WIDTH, CARD_HEIGHT)
+        self.call_button = layout.rect(900, 600, 60, 20)
+        self.concede_button = layout.rect(900, 630, 60, 30)
+        self.message_pos = layout.point(20, 560)
+
     def render_text(self, text, pos):
         img = self.font.render(text, True, (0, 0, 0))
         self.screen.blit(img, pos)
@@ -112,42 +139,46 @@ class Game:
         rects = []
         for i, card in enumerate(player.hand):
             key = f"{card.rank}_of_{card.suit}"
-            img = self.card_images.get(key)
+            img = self.card_images.get(key, self.layout.card_size)
             if not img:
                 continue
             x = 20 + i * (CARD_WIDTH + 10)
-            rect = img.get_rect(topleft=(x, y))
+            rect = self.layout.card_rect(x, y)
             if active and self.dragging and self.dragging[0] == i:
                 rect = img.get_rect(center=self.drag_pos)
             self.screen.blit(img, rect)
             rects.append(rect)
             if player.ai is None:
                 idx_img = self.font.render(str(i), True, (0,0,0))
-                self.screen.blit(idx_img, (rect.x, rect.y + CARD_HEIGHT + 5))
+                self.screen.blit(idx_img, (rect.x, rect.bottom + self.layout.length(5)))
         return rects
 
     def show_state(self, reveal=None):
+        if self.headless:
+            return
+        self.update_layout()
         self.screen.fill((0, 128, 0))
         # opponent hand as backs
         opp = self.players[1 - self.turn]
-        back = self.card_images.get('back')
+        back = self.card_images.get('back', self.layout.card_size)
         for i in range(len(opp.hand)):
-            rect = pygame.Rect(20 + i * (CARD_WIDTH + 10), 20, CARD_WIDTH, CARD_HEIGHT)
+            rect = self.layout.card_rect(20 + i * (CARD_WIDTH + 10), 20)
             if back:
                 self.screen.blit(back, rect)
         # current player hand
         self.hand_rects = self.render_hand(self.players[self.turn], 600, active=True)
         # armies not drawn for simplicity
         if reveal:
-            img = self.card_images.get(f"{reveal.rank}_of_{reveal.suit}")
+            img = self.card_images.get(f"{reveal.rank}_of_{reveal.suit}", self.layout.card_size)
             if img:
                 rect = img.get_rect(center=self.play_area.center)
                 self.screen.blit(img, rect)
         pygame.draw.rect(self.screen, (255, 255, 255), self.play_area, 2)
-        self.render_text('Call', (900, 600))
-        self.render_text('Concede', (900, 630))
-        self.render_text(self.message, (20, 560))
-        pygame.display.flip()
+        self.render_text('Call', self.call_button.topleft)
+        self.render_text('Concede', self.concede_button.topleft)
+        self.render_text(self.message, self.message_pos)
+        if not self.offscreen:
+            pygame.display.flip()
 
     # Input handling
     def wait_for_action(self, reveal, pile):
@@ -165,11 +196,10 @@ class Game:
                             self.dragging = (i, pos[0]-rect.x, pos[1]-rect.y)
                             self.drag_pos = pos
                             break
-                    if 900 <= pos[0] <= 960:
-                        if 600 <= pos[1] <= 620:
-                            return 'call'
-                        if 630 <= pos[1] <= 660:
-                            return 'concede'
+                    if self.call_button.collidepoint(pos):
+                        return 'call'
+                    if self.concede_button.collidepoint(pos):
+                        return 'concede'
                 if event.type == pygame.MOUSEMOTION and self.dragging:
                     self.drag_pos = event.pos
                 if event.type == pygame.MOUSEBUTTONUP and self.dragging:
@@ -184,12 +214,13 @@ class Game:
 
     def duel(self):
         reveal = self.draw_card()
-        drawn_king = None
         while reveal and reveal.rank == 'K':
-            drawn_king = reveal
+            self.beliefs.revealed(reveal)
+            self.drawn_kings.append(reveal)
             reveal = self.draw_card()
         if not reveal:
             return False
+        self.beliefs.revealed(reveal)
         pile = []
         current = self.turn
         opponent = 1 - current
@@ -212,6 +243,7 @@ class Game:
                     self.message = 'invalid card'
                     continue
                 pile.append((current, card))
+                self.beliefs.played(current)
                 self.maintain_hands()
                 current, opponent = opponent, current
             elif action == 'call':
@@ -220,47 +252,51 @@ class Game:
                     continue
                 last_player, last_play = pile[-1]
                 if isinstance(last_play, tuple):
+                    self.beliefs.revealed(*last_play)
                     king_card, last_card = last_play
                     valid = last_card.suit == reveal.suit and last_card.value > reveal.value
                 else:
+                    self.beliefs.revealed(last_play)
                     last_card = last_play
                     valid = last_card.beats(reveal)
-                winner = last_player if valid else opponent
-                loser = opponent if valid else last_player
+                winner = last_player if valid else current
                 win_p = self.players[winner]
-                lose_p = self.players[loser]
                 win_p.armies[reveal.suit].append(reveal)
                 bonus = self.draw_card()
                 if bonus:
                     win_p.armies[reveal.suit].append(bonus)
-                if drawn_king:
-                    win_p.armies[reveal.suit].append(drawn_king)
-                if isinstance(last_play, tuple):
-                    win_p.armies[last_card.suit].append(last_card)
-                    if winner != last_player:
-                        self.discard.append(king_card)
-                    else:
+                    self.beliefs.captured(winner, bonus)
+                win_p.armies[reveal.suit].extend(self.drawn_kings)
+                self.drawn_kings = []
+                if winner == last_player:
+                    if isinstance(last_play, tuple):
                         win_p.armies[king_card.suit].append(king_card)
-                else:
                     win_p.armies[last_card.suit].append(last_card)
-                if winner != last_player:
+                else:
+                    # loser card(s) discarded
                     if isinstance(last_play, tuple):
-                        self.discard.extend([king_card, last_card])
+                        self.discard_cards([king_card, last_card])
                     else:
-                        self.discard.append(last_card)
+                        self.discard_cards([last_card])
+                # earlier answers in the duel are discarded
+                for _, played in pile[:-1]:
+                    if isinstance(played, tuple):
+                        self.discard_cards(played)
+                    else:
+                        self.discard_cards([played])
                 self.turn = winner
                 self.maintain_hands()
                 self.message = f"{win_p.name} wins the duel"
                 break
             elif action == 'concede':
                 self.players[opponent].armies[reveal.suit].append(reveal)
-                if drawn_king:
-                    self.players[opponent].armies[reveal.suit].append(drawn_king)
+                self.players[opponent].armies[reveal.suit].extend(self.drawn_kings)
+                self.drawn_kings = []
                 for _, played in pile:
                     if isinstance(played, tuple):
-                        self.discard.extend(played)
+                        self.discard_cards(played)
                     else:
-                        self.discard.append(played)
+                        self.discard_cards([played])
                 self.turn = opponent
                 self.maintain_hands()
                 self.message = f"{self.players[opponent].name} wins the duel by concession"
@@ -268,9 +304,10 @@ class Game:
             else:
                 self.message = 'unknown command'
         # brief display to show result
-        for _ in range(30):
-            self.show_state()
-            self.clock.tick(30)
+        if not (self.headless or self.offscreen):
+            for _ in range(30):
+                self.show_state()
+                self.clock.tick(30)
         return True
 
     def check_victory(self):
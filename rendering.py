@@ -0,0 +1,98 @@
+import os
+from collections import OrderedDict
+import pygame
+
+# Native size of the images produced by render_cards.py
+CARD_WIDTH = 80
+CARD_HEIGHT = 120
+
+
+class Layout:
+    """Map coordinates of a fixed design resolution onto the current window.
+
+    Each front-end lays out its table for a base size (e.g. 1024x768). The
+    layout scales that design uniformly to fit the window and centres it, so
+    the same rects are used for drawing and for hit-testing.
+    """
+
+    def __init__(self, size, base_size):
+        self.size = size
+        self.base_size = base_size
+        self.scale = min(size[0] / base_size[0], size[1] / base_size[1])
+        self.offset = (
+            (size[0] - base_size[0] * self.scale) / 2,
+            (size[1] - base_size[1] * self.scale) / 2,
+        )
+        self.card_size = self.length(CARD_WIDTH), self.length(CARD_HEIGHT)
+
+    def length(self, n):
+        return max(1, round(n * self.scale))
+
+    def point(self, x, y):
+        return (
+            round(self.offset[0] + x * self.scale),
+            round(self.offset[1] + y * self.scale),
+        )
+
+    def rect(self, x, y, w, h):
+        return pygame.Rect(self.point(x, y), (self.length(w), self.length(h)))
+
+    def card_rect(self, x, y):
+        return pygame.Rect(self.point(x, y), self.card_size)
+
+
+class CardImages:
+    """Card surfaces loaded once and scaled lazily per card size.
+
+    Scaled surfaces are cached per size so blitting never rescales. Only the
+    most recently used ``max_sizes`` sizes are kept; older ones are evicted
+    when the window is resized.
+    """
+
+    def __init__(self, directory='cards', max_sizes=2):
+        self.max_sizes = max_sizes
+        self.originals = {}
+        self.scaled = OrderedDict()
+        for fname in os.listdir(directory):
+            if fname.endswith('.png'):
+                img = pygame.image.load(os.path.join(directory, fname)).convert_alpha()
+                self.originals[fname[:-4]] = img
+
+    def get(self, key, size):
+        images = self.scaled.get(size)
+        if images is None:
+            images = self.scaled[size] = {}
+            while len(self.scaled) > self.max_sizes:
+                self.scaled.popitem(last=False)
+        else:
+            self.scaled.move_to_end(size)
+        img = images.get(key)
+        if img is None:
+            original = self.originals.get(key)
+            if original is None:
+                return None
+            if original.get_size() == size:
+                img = original
+            else:
+                img = pygame.transform.smoothscale(original, size)
+            images[key] = img
+        return img
+
+
+class Fonts:
+    """SysFont instances cached per point size."""
+
+    def __init__(self, name='arial', max_sizes=4):
+        self.name = name
+        self.max_sizes = max_sizes
+        self.fonts = OrderedDict()
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.SysFont(self.name, size)
+            while len(self.fonts) > self.max_sizes:
+                self.fonts.popitem(last=False)
+        else:
+            self.fonts.move_to_end(size)
+        return font